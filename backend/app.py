@@ -29,6 +29,11 @@ import requests
 from bs4 import BeautifulSoup
 ## from openai import OpenAI  # Not needed for direct OpenRouter API calls
 import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -44,6 +49,41 @@ print(f"Loaded API key: {api_key[:6]}..." if api_key else "No API key loaded!")
 if not api_key:
     print("Error: No OPENAI_API_KEY found in .env")
 
+# Set up the local action index (persists extracted actions between requests)
+ACTION_INDEX_PATH = os.getenv(
+    'ACTION_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'actions_index.db')
+)
+action_index_lock = threading.Lock()
+
+# Create the action index tables once, before any request touches them
+def init_action_index():
+    conn = sqlite3.connect(ACTION_INDEX_PATH)
+    try:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS actions (
+                id INTEGER PRIMARY KEY,
+                label TEXT NOT NULL,
+                url TEXT NOT NULL,
+                type TEXT NOT NULL,
+                source TEXT NOT NULL,
+                indexed_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS actions_by_type ON actions(type);
+            CREATE INDEX IF NOT EXISTS actions_by_source ON actions(source);
+            CREATE TABLE IF NOT EXISTS action_terms (
+                term TEXT NOT NULL,
+                action_id INTEGER NOT NULL REFERENCES actions(id),
+                PRIMARY KEY (term, action_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS action_terms_by_action ON action_terms(action_id);
+        """)
+    finally:
+        conn.close()
+
+
+init_action_index()
+
 # ROUTE 1: Health check (test if backend is running)
 @app.route('/api/health', methods=['GET'])
 def health():
@@ -127,11 +167,43 @@ def extract_actions():
                 'url': url,
                 'type': 'form_submit'
             })
+        # Replace this page's entries in the local action index
+        index_actions(url, actions)
         return jsonify(actions)
     except Exception as e:
         print(f"Error in extract_actions: {e}")
         return jsonify({'error': 'Failed to extract actions.'}), 500
 
+# ROUTE 4: Search previously extracted actions (no network access)
+@app.route('/api/actions/search', methods=['GET'])
+def search_actions():
+    try:
+        query = request.args.get('q', '')
+        types = [t.strip() for value in request.args.getlist('type')
+                 for t in value.split(',') if t.strip()]
+        source = request.args.get('source')
+        if source:
+            source = normalize_page_url(source)
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        except ValueError:
+            return jsonify({'error': 'Invalid limit'}), 400
+
+        terms = tokenize_label(query)
+        if not terms and not types and not source:
+            return jsonify({'error': 'Provide q, type or source'}), 400
+
+        results = search_action_index(terms, types, source, limit)
+        return jsonify({
+            'query': query,
+            'types': types,
+            'count': len(results),
+            'results': results
+        })
+    except Exception as e:
+        print(f"Error in search_actions: {e}")
+        return jsonify({'error': 'Failed to search actions.'}), 500
+
 # Determine common action types based on label
 def classify_type(label, url):
     l = label.lower()
@@ -264,6 +336,105 @@ KEY_ACTIONS: [action 1]|[action 2]|[action 3]"""
         return "Error summarizing website", ["Please try again"]
 
 
+# Split an action label (or a search query) into casefolded search terms
+def tokenize_label(label):
+    return sorted(set(t for t in re.split(r'[\W_]+', (label or '').casefold()) if t))
+
+
+# Normalize a page URL so different spellings of one page share a key
+def normalize_page_url(url):
+    parts = urlsplit(url.strip())
+    path = parts.path
+    if path == '/':
+        path = ''
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+# FUNCTION 3: Open the action index
+def open_action_index():
+    """Connect to the SQLite action index (schema is created at startup)"""
+    conn = sqlite3.connect(ACTION_INDEX_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+# FUNCTION 4: Store the actions extracted from one page
+def index_actions(source, actions):
+    """Replace the indexed actions for a page with a freshly extracted set"""
+    source = normalize_page_url(source)
+    indexed_at = datetime.now(timezone.utc).isoformat()
+    try:
+        with action_index_lock:
+            conn = open_action_index()
+            try:
+                with conn:
+                    # Only this page's rows change, so re-analysis stays incremental
+                    conn.execute(
+                        "DELETE FROM action_terms WHERE action_id IN "
+                        "(SELECT id FROM actions WHERE source = ?)", (source,))
+                    conn.execute("DELETE FROM actions WHERE source = ?", (source,))
+                    for action in actions:
+                        cur = conn.execute(
+                            "INSERT INTO actions (label, url, type, source, indexed_at) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (action['label'], action['url'], action['type'], source, indexed_at))
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO action_terms (term, action_id) VALUES (?, ?)",
+                            [(term, cur.lastrowid) for term in tokenize_label(action['label'])])
+            finally:
+                conn.close()
+        print(f"Indexed {len(actions)} actions for {source}")
+    except Exception as e:
+        # Indexing is best effort; the caller still gets its actions
+        print(f"Error indexing actions: {str(e)}")
+
+
+# FUNCTION 5: Look up actions by label terms, category and source page
+def search_action_index(terms, types, source, limit):
+    """Return indexed actions matching any term, filtered by type and source"""
+    conditions = []
+    params = []
+    if terms:
+        placeholders = ','.join('?' * len(terms))
+        conditions.append(
+            f"a.id IN (SELECT action_id FROM action_terms WHERE term IN ({placeholders}))")
+        params.extend(terms)
+    if types:
+        placeholders = ','.join('?' * len(types))
+        conditions.append(f"a.type IN ({placeholders})")
+        params.extend(types)
+    if source:
+        conditions.append("a.source = ?")
+        params.append(source)
+    where = ' AND '.join(conditions) if conditions else '1'
+
+    # Rank by how many query terms each label contains, newest first on ties
+    if terms:
+        placeholders = ','.join('?' * len(terms))
+        score = (f"(SELECT COUNT(*) FROM action_terms t "
+                 f"WHERE t.action_id = a.id AND t.term IN ({placeholders}))")
+        params = list(terms) + params
+    else:
+        score = "0"
+
+    conn = open_action_index()
+    try:
+        rows = conn.execute(
+            f"SELECT a.label, a.url, a.type, a.source, a.indexed_at, {score} AS score "
+            f"FROM actions a WHERE {where} "
+            f"ORDER BY score DESC, a.indexed_at DESC, a.id LIMIT ?",
+            params + [limit]).fetchall()
+    finally:
+        conn.close()
+    return [{
+        'label': row['label'],
+        'url': row['url'],
+        'type': row['type'],
+        'source': row['source'],
+        'indexedAt': row['indexed_at']
+    } for row in rows]
+
+
 # Run the backend
 if __name__ == '__main__':
     print("Backend starting on http://localhost:3000")
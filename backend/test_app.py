@@ -0,0 +1,100 @@
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def index_db(tmp_path, monkeypatch):
+    # Point the action index at a fresh database for each test
+    monkeypatch.setattr(backend, 'ACTION_INDEX_PATH', str(tmp_path / 'actions_index.db'))
+    backend.init_action_index()
+
+
+@pytest.fixture
+def client(index_db):
+    backend.app.config['TESTING'] = True
+    return backend.app.test_client()
+
+
+def action(label, url, type_):
+    return {'label': label, 'url': url, 'type': type_}
+
+
+def seed_index():
+    backend.index_actions('https://a.com', [
+        action('Apply now', 'https://a.com/jobs', 'job_application'),
+        action('Register', 'https://a.com', 'register'),
+    ])
+    backend.index_actions('https://b.com', [
+        action('Contact us', 'https://b.com/contact', 'contact'),
+        action('Apply and register today', 'https://b.com/apply', 'job_application'),
+    ])
+
+
+def test_tokenize_label_keeps_unicode_words():
+    assert backend.tokenize_label('Réserver') == ['réserver']
+    assert backend.tokenize_label('申请') == ['申请']
+    assert backend.tokenize_label('Sign_Up NOW!') == ['now', 'sign', 'up']
+
+
+def test_normalize_page_url():
+    expected = 'https://b.com'
+    assert backend.normalize_page_url('https://b.com') == expected
+    assert backend.normalize_page_url('HTTPS://B.com/') == expected
+    assert backend.normalize_page_url('https://b.com/#x') == expected
+    assert backend.normalize_page_url('https://b.com/Jobs?id=1#top') == 'https://b.com/Jobs?id=1'
+
+
+def test_search_matches_any_term_ranked_by_score(index_db):
+    seed_index()
+    results = backend.search_action_index(['apply', 'register'], [], None, 50)
+    assert [r['label'] for r in results][0] == 'Apply and register today'
+    assert {r['label'] for r in results} == {
+        'Apply and register today', 'Apply now', 'Register'}
+
+
+def test_reanalysis_replaces_page_entries(index_db):
+    seed_index()
+    backend.index_actions('https://a.com/#top', [
+        action('Submit', 'https://a.com', 'form_submit'),
+    ])
+    results = backend.search_action_index([], [], 'https://a.com', 50)
+    assert [r['label'] for r in results] == ['Submit']
+    assert backend.search_action_index(['now'], [], None, 50) == []
+
+
+def test_unicode_labels_are_searchable(index_db):
+    backend.index_actions('https://fr.example', [
+        action('Réserver', 'https://fr.example/r', 'other'),
+        action('申请', 'https://fr.example/s', 'other'),
+    ])
+    search = backend.search_action_index
+    assert [r['label'] for r in search(backend.tokenize_label('RÉSERVER'), [], None, 50)] == ['Réserver']
+    assert search(backend.tokenize_label('server'), [], None, 50) == []
+    assert [r['label'] for r in search(backend.tokenize_label('申请'), [], None, 50)] == ['申请']
+
+
+def test_search_endpoint_accepts_comma_and_repeated_types(client):
+    seed_index()
+    for query in ('type=contact,register', 'type=contact&type=register'):
+        resp = client.get(f'/api/actions/search?{query}')
+        assert resp.status_code == 200
+        assert {r['label'] for r in resp.get_json()['results']} == {'Contact us', 'Register'}
+
+
+def test_search_endpoint_filters_by_normalized_source(client):
+    seed_index()
+    resp = client.get('/api/actions/search?q=apply&source=HTTPS://B.COM/')
+    data = resp.get_json()
+    assert data['count'] == 1
+    assert data['results'][0]['source'] == 'https://b.com'
+
+
+def test_search_endpoint_rejects_empty_query(client):
+    resp = client.get('/api/actions/search?q=%20!')
+    assert resp.status_code == 400
+
+
+def test_search_endpoint_rejects_bad_limit(client):
+    resp = client.get('/api/actions/search?q=apply&limit=lots')
+    assert resp.status_code == 400